@@ -11,28 +11,30 @@ fi
 
 sudo chown $USER: -R artifacts/
 
-mkdir "$GIT_ISH"
-
 sed -i "s@https://install.determinate.systems/nix@https://install.determinate.systems/nix/rev/$GIT_ISH@" nix-installer.sh
-cp nix-installer.sh "$GIT_ISH"/
-
-for artifact in $(find artifacts/ -type f); do
-  chmod +x "$artifact"
-  cp "$artifact" "$GIT_ISH"/
-done
 
 # If any artifact already exists in S3 and the hash is the same, we don't want to reupload
-for file in $(find "$GIT_ISH" -type f); do
+# Check this before staging anything, so an early exit doesn't leave work behind
+while IFS= read -r -d '' artifact; do
   artifact_path="$DEST"/"$(basename "$artifact")"
   md5="$(md5sum "$artifact" | cut -d' ' -f1)"
   obj="$(aws s3api head-object --bucket "$AWS_BUCKET" --key "$artifact_path" || echo '{}')"
-  obj_md5="$(jq -r .ETag <<<"$obj" | jq -r)" # head-object call returns ETag quoted, so `jq -r` again to unquote it
+  obj_md5="$(jq -r '.ETag // empty | fromjson' <<<"$obj")" # head-object call returns ETag quoted, so `fromjson` unquotes it in the same pass
 
   if [[ "$md5" == "$obj_md5" ]]; then
     echo "Artifact $artifact was already uploaded; exiting"
     exit 0
   fi
-done
+done < <(find nix-installer.sh artifacts/ -type f -print0)
+
+mkdir "$GIT_ISH"
+cp nix-installer.sh "$GIT_ISH"/
+
+while IFS= read -r -d '' artifact; do
+  chmod +x "$artifact"
+  # Hardlink rather than copy where possible, since `artifacts/` and "$GIT_ISH" share a filesystem
+  ln "$artifact" "$GIT_ISH"/ 2>/dev/null || cp --reflink=auto "$artifact" "$GIT_ISH"/
+done < <(find artifacts/ -type f -print0)
 
 aws s3 sync "$GIT_ISH"/ s3://"$AWS_BUCKET"/"$GIT_ISH"/ --acl public-read
 aws s3 sync s3://"$AWS_BUCKET"/"$GIT_ISH"/ s3://"$AWS_BUCKET"/"$DEST"/ --acl public-read